@@ -1,20 +1,105 @@
+import os
+import functools
+import multiprocessing
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from scipy.special import expit
 import cupy as cp
+from cupy import cublas
+
+# loss functions, each reduced to a scalar in one pass without temporaries
+_cross_entropy_kernel = cp.ReductionKernel(
+    'T t, T p', 'T loss', '-t * log(min(max(p, (T)1e-9), (T)(1 - 1e-9)))',
+    'a + b', 'loss = a', '0', 'perceptron_cross_entropy')
+_squared_error_kernel = cp.ReductionKernel(
+    'T t, T p', 'T loss', '(t - p) * (t - p)',
+    'a + b', 'loss = a', '0', 'perceptron_squared_error')
 
-# loss functions
 def cross_entropy_loss(y_true, y_pred):
     samples_amount = y_true.shape[0]
-    y_pred_clipped = cp.clip(y_pred, 1e-9, 1 - 1e-9)
-    return -cp.sum(y_true * cp.log(y_pred_clipped)) / samples_amount
+    # the kernels take one element type, promote like the elementwise version did
+    dtype = cp.result_type(y_true.dtype, y_pred.dtype, cp.float32)
+    return _cross_entropy_kernel(cp.asarray(y_true, dtype=dtype), cp.asarray(y_pred, dtype=dtype)) / samples_amount
 
 def mean_squared_error(y_true, y_pred):
-    return cp.mean((y_true - y_pred) ** 2)
+    dtype = cp.result_type(y_true.dtype, y_pred.dtype, cp.float32)
+    return _squared_error_kernel(cp.asarray(y_true, dtype=dtype), cp.asarray(y_pred, dtype=dtype)) / y_true.size
+
+# output deltas, (y - a) * f'(a) computed in a single pass into d
+_linear_output_delta = cp.ElementwiseKernel(
+    'T y, T a', 'T d', 'd = y - a', 'perceptron_linear_output_delta')
+_sigmoid_output_delta = cp.ElementwiseKernel(
+    'T y, T a', 'T d', 'd = (y - a) * a * (1 - a)', 'perceptron_sigmoid_output_delta')
+_cube_output_delta = cp.ElementwiseKernel(
+    'T y, T a', 'T d', 'd = (y - a) * 2 * a * a', 'perceptron_cube_output_delta')
+_relu_output_delta = cp.ElementwiseKernel(
+    'T y, T a', 'T d', 'd = a > 0 ? y - a : (T)0', 'perceptron_relu_output_delta')
+
+# hidden deltas, d *= f'(a) in place
+_sigmoid_hidden_delta = cp.ElementwiseKernel(
+    'T a', 'T d', 'd *= a * (1 - a)', 'perceptron_sigmoid_hidden_delta')
+_cube_hidden_delta = cp.ElementwiseKernel(
+    'T a', 'T d', 'd *= 2 * a * a', 'perceptron_cube_hidden_delta')
+_relu_hidden_delta = cp.ElementwiseKernel(
+    'T a', 'T d', 'd = a > 0 ? d : (T)0', 'perceptron_relu_hidden_delta')
+
+_OUTPUT_DELTAS = {
+    "sigmoid": _sigmoid_output_delta,
+    "relu": _relu_output_delta,
+    "linear": _linear_output_delta,
+    "cube": _cube_output_delta,
+}
+
+# None means the linear derivative, the error passes through unchanged
+_HIDDEN_DELTAS = {
+    "sigmoid": _sigmoid_hidden_delta,
+    "relu": _relu_hidden_delta,
+    "linear": None,
+    "cube": _cube_hidden_delta,
+}
+
+# sigmoid(z) == (tanh(z / 2) + 1) / 2, one tanh and no division or overflowing exp
+_sigmoid_kernel = cp.ElementwiseKernel(
+    'T z', 'T a', 'a = (T)0.5 * tanh((T)0.5 * z) + (T)0.5', 'perceptron_sigmoid')
+
+# one thread per row computes the max, the exp-sum and the normalized values in place
+_softmax_kernel = cp.ElementwiseKernel(
+    'raw T z, int32 cols', 'raw T a',
+    '''
+    const ptrdiff_t row = (ptrdiff_t)i * cols;
+    T m = z[row];
+    for (int j = 1; j < cols; ++j) m = max(m, z[row + j]);
+    T s = 0;
+    for (int j = 0; j < cols; ++j) {
+        a[row + j] = exp(z[row + j] - m);
+        s += a[row + j];
+    }
+    s += (T)1e-9;
+    for (int j = 0; j < cols; ++j) a[row + j] /= s;
+    ''',
+    'perceptron_softmax')
+
+def _softmax(z, out):
+    # raw indexing walks C-ordered rows, so a non-contiguous out is filled through a copy
+    if not out.flags.c_contiguous:
+        out[...] = _softmax(z, cp.empty(z.shape, dtype=out.dtype))
+        return out
+    _softmax_kernel(cp.ascontiguousarray(z), z.shape[1], out, size=z.shape[0])
+    return out
+
+# activations write into `out` (which may be `z` itself); linear layers share
+# their z buffer, so they have nothing to do
+_ACTIVATIONS = {
+    "sigmoid": _sigmoid_kernel,
+    "relu": lambda z, out: cp.maximum(0, z, out=out),
+    "linear": lambda z, out: z,
+    "cube": lambda z, out: cp.power(z, 3, out=out),
+    "softmax": _softmax,
+}
 
 class Network:
-    def __init__(self, layers, activations, loss_function="mse", seed=None):
+    def __init__(self, layers, activations, loss_function="mse", seed=None, dtype=cp.float32):
         if seed:
             if isinstance(seed, (np.ndarray, cp.ndarray)):
                 seed = int(seed.get() if isinstance(seed, cp.ndarray) else seed)
@@ -25,79 +110,91 @@ class Network:
         self.biases = []
         self.activations = activations  
         self.loss_function = loss_function
+        self.dtype = dtype
+        # resolve activations once so forward/backward call them directly
+        self._act_fns = [_ACTIVATIONS[a] for a in activations]
+        if activations[-1] == "softmax" and loss_function == "cross_entropy":
+            self._output_delta = _linear_output_delta
+        else:
+            self._output_delta = _OUTPUT_DELTAS[activations[-1]]
+        self._hidden_deltas = [_HIDDEN_DELTAS[a] for a in activations[:-1]]
 
         # initialize weights and biases
         for i in range(self.num_layers - 1):
             limit = cp.sqrt(6 / (layers[i] + layers[i + 1])) 
-            self.weights.append(cp.random.uniform(-limit, limit, (layers[i], layers[i + 1])).astype(cp.float32)) 
-            self.biases.append(cp.zeros((1, layers[i + 1]), dtype=cp.float32))
+            self.weights.append(cp.random.uniform(-limit, limit, (layers[i], layers[i + 1])).astype(dtype)) 
+            self.biases.append(cp.zeros((1, layers[i + 1]), dtype=dtype))
+        self._weight_updates = [cp.empty_like(w) for w in self.weights]
+        self._bias_updates = [cp.empty_like(b) for b in self.biases]
 
         self.weight_error_history = []
         self.bias_error_history = []
         self.weight_values_history = []
+        self._forward_cache = {}
+        self._delta_cache = {}
 
     def apply_activation(self, z, activation):
         z = cp.array(z)
-        if activation == "sigmoid":
-            return 1 / (1 + cp.exp(-z))
-        elif activation == "relu":
-            return cp.maximum(0, z)
-        elif activation == "linear":
-            return z
-        elif activation == "cube":
-            return z**3
-        elif activation == "softmax":
-            z_stable = z - cp.max(z, axis=1, keepdims=True)
-            exps = cp.exp(z_stable)
-            return exps / (cp.sum(exps, axis=1, keepdims=True) + 1e-9)
+        return _ACTIVATIONS[activation](z, z)
 
     def apply_activation_derivative(self, a, activation):
-        if activation == "sigmoid":
-            return a * (1 - a)
-        elif activation == "relu":
-            return cp.where(a > 0, 1, 0)
-        elif activation == "linear":
-            return 1
-        elif activation == "cube":
-            return 2 * a ** 2
-
-
-    def forward(self, X):
-        X = cp.array(X) if not isinstance(X, cp.ndarray) else X
-        self.activations_values = [X]
-        self.z_values = []
+        # f'(a), obtained by applying the hidden-delta rule to a delta of ones
+        derivative = cp.ones_like(a)
+        if _HIDDEN_DELTAS[activation] is not None:
+            _HIDDEN_DELTAS[activation](a, derivative)
+        return derivative
+
+    def _forward_buffers(self, num_samples, reuse_buffers):
+        # training batches reuse their z and activation arrays, one-off passes
+        # (loss printing, predict) get fresh ones that are freed afterwards
+        if reuse_buffers and num_samples in self._forward_cache:
+            return self._forward_cache[num_samples]
+        z_values, activations_values = [], [None]
+        for i in range(self.num_layers - 1):
+            z = cp.empty((num_samples, self.weights[i].shape[1]), dtype=self.dtype)
+            z_values.append(z)
+            activations_values.append(z if self.activations[i] == "linear" else cp.empty_like(z))
+        if reuse_buffers:
+            self._forward_cache[num_samples] = (z_values, activations_values)
+        return z_values, activations_values
+
+    def _delta_buffers(self, num_samples):
+        # delta arrays plus a column of ones that turns the bias-gradient sum into a gemm
+        if num_samples not in self._delta_cache:
+            deltas = [cp.empty((num_samples, w.shape[1]), dtype=self.dtype) for w in self.weights]
+            self._delta_cache[num_samples] = (deltas, cp.ones((num_samples, 1), dtype=self.dtype))
+        return self._delta_cache[num_samples]
+
+    def forward(self, X, reuse_buffers=False):
+        X = cp.asarray(X, dtype=self.dtype)
+        self.z_values, self.activations_values = self._forward_buffers(X.shape[0], reuse_buffers)
+        self.activations_values[0] = X
 
         for i in range(self.num_layers - 1):
-            z = cp.dot(self.activations_values[-1], self.weights[i]) + self.biases[i]
-            self.z_values.append(z)
-            a = self.apply_activation(z, self.activations[i])
-            self.activations_values.append(cp.array(a, dtype=cp.float32))
+            z = self.z_values[i]
+            cublas.gemm('N', 'N', self.activations_values[i], self.weights[i], out=z)
+            z += self.biases[i]
+            self._act_fns[i](z, self.activations_values[i + 1])
         return self.activations_values[-1]
 
     def backward(self, X, y, output, learning_rate, save_history):
-        deltas = []
-
-        if self.activations[-1] == "softmax" and self.loss_function == "cross_entropy":
-            output_delta =  y - output
-        else:
-            output_error = y - output
-            output_delta = output_error * self.apply_activation_derivative(output, self.activations[-1])
+        deltas, ones = self._delta_buffers(output.shape[0])
 
-        deltas.append(output_delta.astype(cp.float32))
+        self._output_delta(y, output, deltas[-1])
         
         # backpropagation
         for i in range(self.num_layers - 2, 0, -1):
-            z = self.z_values[i - 1]  
-            delta = cp.dot(deltas[-1], self.weights[i].T) * self.apply_activation_derivative(self.activations_values[i], self.activations[i - 1])
-            # deltas.append(delta)
-            deltas.append(delta.astype(cp.float32))
-
-        deltas.reverse()
+            cublas.gemm('N', 'T', deltas[i], self.weights[i], out=deltas[i - 1])
+            if self._hidden_deltas[i - 1] is not None:
+                self._hidden_deltas[i - 1](self.activations_values[i], deltas[i - 1])
 
         # update weights and biases
         for i in range(self.num_layers - 1):
-            weight_update = cp.dot(self.activations_values[i].T, deltas[i]) * learning_rate
-            bias_update = cp.sum(deltas[i], axis=0, keepdims=True) * learning_rate
+            weight_update = self._weight_updates[i]
+            bias_update = self._bias_updates[i]
+            # the learning rate is applied by gemm's alpha
+            cublas.gemm('T', 'N', self.activations_values[i], deltas[i], out=weight_update, alpha=learning_rate)
+            cublas.gemm('T', 'N', ones, deltas[i], out=bias_update, alpha=learning_rate)
 
             self.weights[i] += weight_update
             self.biases[i] += bias_update
@@ -109,57 +206,69 @@ class Network:
         if save_history:
             self.weight_values_history.append([w.copy() for w in self.weights])
 
+    def _train_epoch(self, batches, learning_rate, save_history):
+        for X_batch, y_batch in batches:
+            output = self.forward(X_batch, reuse_buffers=True)
+            self.backward(X_batch, y_batch, output, learning_rate, save_history)
+
+    def _capture_epoch(self, stream, batches, learning_rate):
+        # record one epoch of batch steps as a CUDA graph, replayed later with a single launch;
+        # the buffers are allocated first so nothing inside the graph allocates memory
+        for X_batch, _ in batches:
+            self._forward_buffers(X_batch.shape[0], True)
+            self._delta_buffers(X_batch.shape[0])
+        stream.begin_capture(cp.cuda.runtime.streamCaptureModeRelaxed)
+        self._train_epoch(batches, learning_rate, False)
+        return stream.end_capture()
+
     def train(self, X, y, epochs, learning_rate, print_loss=True, save_history=True, batch_size=2048): 
-        X = cp.array(X, dtype=cp.float32)
-        y = cp.array(y, dtype=cp.float32)
-        num_samples = X.shape[0] 
-        for epoch in range(epochs): 
-            permutation = cp.random.permutation(num_samples) 
-            X_shuffled = X[permutation] 
-            y_shuffled = y[permutation]
-            for i in range(0, num_samples, batch_size): 
-                X_batch = X_shuffled[i:i + batch_size]
-                y_batch = y_shuffled[i:i + batch_size] 
-                output = self.forward(X_batch)
-                self.backward(X_batch, y_batch, output, learning_rate, save_history)
-
-                cp.cuda.Stream.null.synchronize() 
-                cp.get_default_memory_pool().free_all_blocks()
-                
-            if epoch % 1000 == 0 and print_loss: 
-                if self.loss_function == "cross_entropy": 
-                    loss = cross_entropy_loss(y, self.forward(X)) 
-                else: 
-                    loss = mean_squared_error(y, self.forward(X)) 
-                print(f'Epoch {epoch}, Loss: {loss}')
+        # a blocking stream stays ordered with work on the default stream before and after training
+        stream = cp.cuda.Stream()
+        with stream:
+            X = cp.array(X, dtype=self.dtype)
+            y = cp.array(y, dtype=self.dtype)
+            num_samples = X.shape[0] 
+            # batches are fixed views into the shuffled copies, so every epoch runs the same
+            # kernels on the same memory and can be replayed from a graph
+            X_shuffled = cp.empty_like(X)
+            y_shuffled = cp.empty_like(y)
+            batches = [(X_shuffled[i:i + batch_size], y_shuffled[i:i + batch_size]) for i in range(0, num_samples, batch_size)]
+            # history bookkeeping allocates every batch, so it keeps the per-batch loop
+            epoch_graph = None if save_history else self._capture_epoch(stream, batches, learning_rate)
+
+            for epoch in range(epochs): 
+                permutation = cp.random.permutation(num_samples) 
+                cp.take(X, permutation, axis=0, out=X_shuffled)
+                cp.take(y, permutation, axis=0, out=y_shuffled)
+                if epoch_graph is not None:
+                    epoch_graph.launch(stream)
+                else:
+                    self._train_epoch(batches, learning_rate, save_history)
+
+                if epoch % 1000 == 0 and print_loss: 
+                    if self.loss_function == "cross_entropy": 
+                        loss = cross_entropy_loss(y, self.forward(X)) 
+                    else: 
+                        loss = mean_squared_error(y, self.forward(X)) 
+                    print(f'Epoch {epoch}, Loss: {loss}')
     
     def plot_error_history(self):
-        weight_error_history = cp.array(self.weight_error_history)
-        bias_error_history = cp.array(self.bias_error_history)
-
         num_layers = self.num_layers - 1
 
-        for layer in range(num_layers):
-            fig, ax = plt.subplots(figsize=(10, 5))
-            layer_weight_errors = weight_error_history[layer::num_layers]
-            ax.plot(layer_weight_errors, label=f'Weight Update Norms (Layer {layer+1} -> {layer+2})')
-            ax.set_title(f'Weight Error Over Epochs (Layer {layer+1} -> {layer+2})')
-            ax.set_xlabel('Epochs')
-            ax.set_ylabel('Error (Norm)')
-            ax.legend()
-            plt.tight_layout()
-            plt.show()
-
-        for layer in range(num_layers):
-            fig, ax = plt.subplots(figsize=(10, 5))
-            layer_bias_errors = bias_error_history[layer::num_layers]
-            ax.plot(layer_bias_errors, label=f'Bias Update Norms (Layer {layer+1} -> {layer+2})')
-            ax.set_title(f'Bias Error Over Epochs (Layer {layer+1} -> {layer+2})')
-            ax.set_xlabel('Epochs')
-            ax.set_ylabel('Error (Norm)')
-            ax.legend()
-            plt.tight_layout()
-            plt.show()
+        # one row per update, one column per layer
+        weight_error_history = cp.asnumpy(cp.array(self.weight_error_history)).reshape(-1, num_layers)
+        bias_error_history = cp.asnumpy(cp.array(self.bias_error_history)).reshape(-1, num_layers)
+
+        for name, error_history in (("Weight", weight_error_history), ("Bias", bias_error_history)):
+            for layer in range(num_layers):
+                fig, ax = plt.subplots(figsize=(10, 5))
+                ax.plot(error_history[:, layer], label=f'{name} Update Norms (Layer {layer+1} -> {layer+2})')
+                ax.set_title(f'{name} Error Over Epochs (Layer {layer+1} -> {layer+2})')
+                ax.set_xlabel('Epochs')
+                ax.set_ylabel('Error (Norm)')
+                ax.legend()
+                plt.tight_layout()
+                plt.show()
     
     def plot_weight_value_history(self):
         num_layers = self.num_layers - 1
@@ -184,7 +293,6 @@ class Network:
         if(regression):
             return predictions
         else:    
-            predictions = self.forward(X)
             return cp.argmax(predictions, axis=1)
 
     
@@ -194,318 +302,395 @@ def calculate_accuracy(y_true, y_pred):
     accuracy = (correct_predictions / len(y_true)) * 100
     return accuracy
 
-def perform_tests_simple(path, random_seed=False, print_results=False, plot_results=False):
+def one_hot(cls, num_classes):
+    y = np.zeros((cls.size, num_classes), dtype=np.float32)
+    y[np.arange(cls.size), cls] = 1
+    return y
+
+_data_cache = {}
+
+def prepare_data(folder_path):
+    # every csv in the folder is parsed once and stored together in cache.npz,
+    # keyed as "<file name>:<column>"; files map to {column: ndarray}
+    folder_path = os.path.abspath(folder_path)
+    if folder_path not in _data_cache:
+        csv_files = sorted(f for f in os.listdir(folder_path) if f.endswith('.csv'))
+        cache_path = os.path.join(folder_path, 'cache.npz')
+        files = None
+        if os.path.exists(cache_path) and all(os.path.getmtime(cache_path) >= os.path.getmtime(os.path.join(folder_path, f)) for f in csv_files):
+            files = {}
+            with np.load(cache_path) as cached:
+                for key in cached.files:
+                    name, column = key.rsplit(':', 1)
+                    files.setdefault(name, {})[column] = cached[key]
+            if set(files) != set(csv_files):
+                files = None
+        if files is None:
+            files = {}
+            for f in csv_files:
+                data = pd.read_csv(os.path.join(folder_path, f), delimiter=',', header=0)
+                files[f] = {column: data[column].to_numpy() for column in data.columns}
+            np.savez(cache_path, **{f"{name}:{column}": values for name, data in files.items() for column, values in data.items()})
+        _data_cache[folder_path] = files
+    return _data_cache[folder_path]
+
+def read_csv_cached(path):
+    return prepare_data(os.path.dirname(path))[os.path.basename(path)]
+
+def stack_columns(data, columns):
+    return np.column_stack([data[column] for column in columns])
+
+def create_test_pool():
+    # one pool per test session, so each worker starts cupy and loads the kernels once;
+    # spawn rather than fork, a forked child cannot use CUDA once the parent has initialized it
+    return multiprocessing.get_context("spawn").Pool(min(4, os.cpu_count() or 1))
+
+def _run_tests(run_one, numbers, path, seed, plot_results, pool, dtype):
+    # build the folder cache up front so the workers only read it
+    prepare_data(path)
+    run = functools.partial(run_one, path=path, seed=seed, plot_results=plot_results, last_num=numbers[-1],
+                            dtype=dtype)
+    # plots need the trained networks in this process
+    if pool is None or plot_results:
+        return [run(num) for num in numbers]
+    return pool.map(run, numbers)
+
+def _run_one_simple(num, path, seed, plot_results=False, last_num=None, dtype=np.float32):
     layers = [2, 4, 2]
     activations = ["linear", "sigmoid"]  # "relu", "sigmoid" or "linear", "softmax"
     learning_rate = 0.0001
     epochs = 500
+    loss_function = "cross_entropy"  # "cross_entropy" or "mse"
+
+    train_file_path = path + f"data.simple.train.{num}.csv"
+
+    data = read_csv_cached(train_file_path)
+    X = stack_columns(data, ['x', 'y'])
+    cls = data['cls'] - 1 
+    permutation = np.random.permutation(len(X))
+    X = X[permutation]
+    cls = cls[permutation]
+    y = one_hot(cls, 2)
+
+    nn = Network(layers, activations, loss_function=loss_function, seed=seed, dtype=dtype)
+    nn.train(X, y, epochs, learning_rate, False, plot_results)
+
+    test_file_path = path + f"data.simple.test.{num}.csv"
+
+    data = read_csv_cached(test_file_path)
+    X = stack_columns(data, ['x', 'y'])
+    cls = data['cls'] - 1 
+    y = one_hot(cls, 2)
+    predictions = nn.predict(X)
+    accuracy = calculate_accuracy(y, predictions)
+
+    if plot_results:
+        if num == last_num:
+            plt.figure(figsize=(12, 5))
+
+            plt.subplot(1, 2, 1)
+            plt.title("Wizualizacja zbióru uczącego")
+            plt.scatter(X[:, 0], X[:, 1], c=cls, cmap='viridis', edgecolor='k')
+            plt.xlabel("Cecha 1")
+            plt.ylabel("Cecha 2")
+
+            plt.subplot(1, 2, 2)
+            plt.title("Efekty klasyfikacji")
+
+            x_min, x_max = X[:, 0].min() - 1, X[:, 0].max() + 1
+            y_min, y_max = X[:, 1].min() - 1, X[:, 1].max() + 1
+            xx, yy = np.meshgrid(np.linspace(x_min, x_max, 40), np.linspace(y_min, y_max, 40))
+
+            Z = nn.predict(np.c_[xx.ravel(), yy.ravel()])
+            Z = Z.reshape(xx.shape)
+
+            plt.contourf(xx, yy, Z, cmap='coolwarm', alpha=0.3)
+
+            plt.scatter(X[:, 0], X[:, 1], c=predictions, s=20, edgecolor="k", cmap='coolwarm')
+            plt.title(f"Wizualizacja granicy decyzji")
+            plt.show()
+
+        nn.plot_weight_value_history()
+        nn.plot_error_history()
+
+    return float(accuracy)
+
+def perform_tests_simple(path, random_seed=False, print_results=False, plot_results=False, pool=None, dtype=np.float32):
     if random_seed:
         seed = np.random.randint(1, 100)
     else:
         seed = 42
     print('seed', seed)
-    loss_function = "cross_entropy"  # "cross_entropy" or "mse"
 
     numbers = [100, 500, 1000, 10000]
-    accuracy = list()
-    for num in numbers:
-        train_file_path = path + f"data.simple.train.{num}.csv"
-
-        data = pd.read_csv(train_file_path, delimiter=',', header=0)
-        data = data.sample(frac=1).reset_index(drop=True)
-        X = data[['x', 'y']].to_numpy()
-        cls = data['cls'].to_numpy() - 1 
-        y = np.eye(2)[cls]
-
-        nn = Network(layers, activations, loss_function=loss_function, seed=seed)
-        nn.train(X, y, epochs, learning_rate, False)
-
-        test_file_path = path + f"data.simple.test.{num}.csv"
-
-        data = pd.read_csv(test_file_path, delimiter=',', header=0)
-        X = data[['x', 'y']].to_numpy()
-        cls = data['cls'].to_numpy() - 1 
-        y = np.eye(2)[cls]
-        predictions = nn.predict(X)
-        accuracy.append(calculate_accuracy(y, predictions))
-        if print_results:
-            print(f"Accuracy for data.simple.test.{num}: ", calculate_accuracy(y, predictions), "%")
-
-        if plot_results:
-            if num == numbers[-1]:
-                plt.figure(figsize=(12, 5))
-
-                plt.subplot(1, 2, 1)
-                plt.title("Wizualizacja zbióru uczącego")
-                plt.scatter(X[:, 0], X[:, 1], c=cls, cmap='viridis', edgecolor='k')
-                plt.xlabel("Cecha 1")
-                plt.ylabel("Cecha 2")
-
-                plt.subplot(1, 2, 2)
-                plt.title("Efekty klasyfikacji")
-
-                x_min, x_max = X[:, 0].min() - 1, X[:, 0].max() + 1
-                y_min, y_max = X[:, 1].min() - 1, X[:, 1].max() + 1
-                xx, yy = np.meshgrid(np.linspace(x_min, x_max, 40), np.linspace(y_min, y_max, 40))
-
-                Z = nn.predict(np.c_[xx.ravel(), yy.ravel()])
-                Z = Z.reshape(xx.shape)
-
-                plt.contourf(xx, yy, Z, cmap='coolwarm', alpha=0.3)
-
-                plt.scatter(X[:, 0], X[:, 1], c=predictions, s=20, edgecolor="k", cmap='coolwarm')
-                plt.title(f"Wizualizacja granicy decyzji")
-                plt.show()
-
-            nn.plot_weight_value_history()
-            nn.plot_error_history()
-
+    accuracy = _run_tests(_run_one_simple, numbers, path, seed, plot_results, pool, dtype)
+    if print_results:
+        for num, result in zip(numbers, accuracy):
+            print(f"Accuracy for data.simple.test.{num}: ", result, "%")
     return sum(accuracy) / len(accuracy)
 
-def perform_tests_three_gauss(path, random_seed=False, print_results=False, plot_results=False):
+def _run_one_three_gauss(num, path, seed, plot_results=False, last_num=None, dtype=np.float32):
     layers = [2, 4, 3]
     activations = ["linear", "sigmoid"]
     learning_rate = 0.0001
     epochs = 1000
-    if random_seed:
-        seed = np.random.randint(1, 100)
-    else:
-        seed = 42
-    print('seed', seed)
     loss_function = "cross_entropy"
 
-    numbers = [100, 500, 1000, 10000]
-    accuracy = list()
-    for num in numbers:
-        train_file_path = path + f"data.three_gauss.train.{num}.csv"
-
-        data = pd.read_csv(train_file_path, delimiter=',', header=0)
-        data = data.sample(frac=1).reset_index(drop=True)
-        X = data[['x', 'y']].to_numpy()
-        cls = data['cls'].to_numpy() - 1
-        y = np.eye(3)[cls]
-
-        nn = Network(layers, activations, loss_function=loss_function, seed=seed)
-        nn.train(X, y, epochs, learning_rate, False)
-
-        test_file_path = path + f"data.three_gauss.test.{num}.csv"
-        data = pd.read_csv(test_file_path, delimiter=',', header=0)
-        X = data[['x', 'y']].to_numpy()
-        cls = data['cls'].to_numpy() - 1 
-        y = np.eye(3)[cls]
-        
-        predictions = nn.predict(X)
-        accuracy.append(calculate_accuracy(y, predictions))
-        if print_results:
-            print(f"Accuracy for data.simple.test.{num}: ", calculate_accuracy(y, predictions), "%")
+    train_file_path = path + f"data.three_gauss.train.{num}.csv"
 
-        if plot_results:
-            if num == numbers[-1]:
-                plt.figure(figsize=(12, 5))
+    data = read_csv_cached(train_file_path)
+    X = stack_columns(data, ['x', 'y'])
+    cls = data['cls'] - 1
+    permutation = np.random.permutation(len(X))
+    X = X[permutation]
+    cls = cls[permutation]
+    y = one_hot(cls, 3)
 
-                plt.subplot(1, 2, 1)
-                plt.title("Wizualizacja zbioru uczącego")
-                plt.scatter(X[:, 0], X[:, 1], c=cls, cmap='viridis', edgecolor='k')
-                plt.xlabel("Cecha 1")
-                plt.ylabel("Cecha 2")
+    nn = Network(layers, activations, loss_function=loss_function, seed=seed, dtype=dtype)
+    nn.train(X, y, epochs, learning_rate, False, plot_results)
 
-                plt.subplot(1, 2, 2)
-                plt.title("Efekty klasyfikacji")
+    test_file_path = path + f"data.three_gauss.test.{num}.csv"
+    data = read_csv_cached(test_file_path)
+    X = stack_columns(data, ['x', 'y'])
+    cls = data['cls'] - 1 
+    y = one_hot(cls, 3)
 
-                x_min, x_max = X[:, 0].min() - 1, X[:, 0].max() + 1
-                y_min, y_max = X[:, 1].min() - 1, X[:, 1].max() + 1
-                xx, yy = np.meshgrid(np.linspace(x_min, x_max, 40), np.linspace(y_min, y_max, 40))
+    predictions = nn.predict(X)
+    accuracy = calculate_accuracy(y, predictions)
 
-                Z = nn.predict(np.c_[xx.ravel(), yy.ravel()])
-                Z = Z.reshape(xx.shape)
+    if plot_results:
+        if num == last_num:
+            plt.figure(figsize=(12, 5))
 
-                plt.contourf(xx, yy, Z, cmap='coolwarm', alpha=0.3)
+            plt.subplot(1, 2, 1)
+            plt.title("Wizualizacja zbioru uczącego")
+            plt.scatter(X[:, 0], X[:, 1], c=cls, cmap='viridis', edgecolor='k')
+            plt.xlabel("Cecha 1")
+            plt.ylabel("Cecha 2")
 
-                plt.scatter(X[:, 0], X[:, 1], c=predictions, s=20, edgecolor="k", cmap='coolwarm')
-                plt.title(f"Wizualizacja granicy decyzji")
-                plt.show()
-            nn.plot_weight_value_history()
-            nn.plot_error_history()
+            plt.subplot(1, 2, 2)
+            plt.title("Efekty klasyfikacji")
+
+            x_min, x_max = X[:, 0].min() - 1, X[:, 0].max() + 1
+            y_min, y_max = X[:, 1].min() - 1, X[:, 1].max() + 1
+            xx, yy = np.meshgrid(np.linspace(x_min, x_max, 40), np.linspace(y_min, y_max, 40))
+
+            Z = nn.predict(np.c_[xx.ravel(), yy.ravel()])
+            Z = Z.reshape(xx.shape)
+
+            plt.contourf(xx, yy, Z, cmap='coolwarm', alpha=0.3)
+
+            plt.scatter(X[:, 0], X[:, 1], c=predictions, s=20, edgecolor="k", cmap='coolwarm')
+            plt.title(f"Wizualizacja granicy decyzji")
+            plt.show()
+        nn.plot_weight_value_history()
+        nn.plot_error_history()
 
+    return float(accuracy)
+
+def perform_tests_three_gauss(path, random_seed=False, print_results=False, plot_results=False, pool=None, dtype=np.float32):
+    if random_seed:
+        seed = np.random.randint(1, 100)
+    else:
+        seed = 42
+    print('seed', seed)
+
+    numbers = [100, 500, 1000, 10000]
+    accuracy = _run_tests(_run_one_three_gauss, numbers, path, seed, plot_results, pool, dtype)
+    if print_results:
+        for num, result in zip(numbers, accuracy):
+            print(f"Accuracy for data.simple.test.{num}: ", result, "%")
     return sum(accuracy) / len(accuracy)
 
-def perform_tests_activation(path, random_seed=False, print_results=False, plot_results=False):
+def _run_one_activation(num, path, seed, plot_results=False, last_num=None, dtype=np.float32):
     layers = [1, 2, 1]  
     activations = ["sigmoid", "linear"] 
     #learning_rate = 0.01
     epochs = 1000
+    loss_function = "mse" 
+
+    learning_rate = 1.0/num
+    train_file_path = path + f"data.activation.train.{num}.csv"
+    data = read_csv_cached(train_file_path)
+
+    X = stack_columns(data, ['x']) 
+    y = stack_columns(data, ['y']) 
+    permutation = np.random.permutation(len(X))
+    X = X[permutation]
+    y = y[permutation]
+
+    # standarization of data
+    mean_X = np.mean(X, axis=0)
+    std_X = np.std(X, axis=0)
+    X_standardized = (X - mean_X) / std_X
+
+    mean_y = np.mean(y, axis=0)
+    std_y = np.std(y, axis=0)
+    y_standardized = (y - mean_y) / std_y
+
+    nn = Network(layers, activations, loss_function=loss_function, seed=seed, dtype=dtype)
+    nn.train(X_standardized, y_standardized, epochs, learning_rate, False, plot_results)  
+
+    test_file_path = path + f"data.activation.test.{num}.csv"
+    data = read_csv_cached(test_file_path)
+    X_test = stack_columns(data, ['x'])  
+    y_test = stack_columns(data, ['y']) 
+    X_test_standardized = (X_test - mean_X) / std_X
+
+
+    predictions_standardized = nn.predict(X_test_standardized, True)
+    predictions = predictions_standardized * std_y + mean_y
+
+    mse = mean_squared_error(y_test, predictions)
+
+    if plot_results:
+        if num == last_num:
+            plt.figure(figsize=(10, 6))
+            plt.scatter(X, y, color='blue', label='Training Data', alpha=0.5, s=0.1)
+            plt.xlabel('X')
+            plt.ylabel('Y')
+            plt.legend()
+            plt.grid()
+            plt.show()
+
+            plt.figure(figsize=(10, 6))
+            plt.scatter(X_test, y_test, color='green', label='Test Data', alpha=0.5, s=1)
+            plt.plot(X_test, predictions, color='red', linewidth=1, label='Predictions', linestyle="-")
+            plt.xlabel('X')
+            plt.ylabel('Y')
+            plt.legend()
+            plt.grid()
+            plt.show()
+
+        nn.plot_weight_value_history()
+        nn.plot_error_history()
+
+    return float(mse)
+
+def perform_tests_activation(path, random_seed=False, print_results=False, plot_results=False, pool=None, dtype=np.float32):
     if random_seed:
         seed = np.random.randint(1, 100)
     else:
         seed = 42
     print('seed', seed)
-    loss_function = "mse" 
 
     numbers = [100, 500, 1000, 10000]
-    MSEs = list()
-    for num in numbers:
-        learning_rate = 1.0/num
-        train_file_path = path + f"data.activation.train.{num}.csv"
-        data = pd.read_csv(train_file_path, delimiter=',', header=0)
-        data = data.sample(frac=1).reset_index(drop=True)  
-
-        X = data[['x']].to_numpy() 
-        y = data[['y']].to_numpy() 
-
-        # standarization of data
-        mean_X = np.mean(X, axis=0)
-        std_X = np.std(X, axis=0)
-        X_standardized = (X - mean_X) / std_X
-        
-        mean_y = np.mean(y, axis=0)
-        std_y = np.std(y, axis=0)
-        y_standardized = (y - mean_y) / std_y
-
-        nn = Network(layers, activations, loss_function=loss_function, seed=seed)
-        nn.train(X_standardized, y_standardized, epochs, learning_rate, False)  
-
-        test_file_path = path + f"data.activation.test.{num}.csv"
-        data = pd.read_csv(test_file_path, delimiter=',', header=0)
-        X_test = data[['x']].to_numpy()  
-        y_test = data[['y']].to_numpy() 
-        X_test_standardized = (X_test - mean_X) / std_X
-
-
-        predictions_standardized = nn.predict(X_test_standardized, True)
-        predictions = predictions_standardized * std_y + mean_y
-
-        mse = mean_squared_error(y_test, predictions)
-        MSEs.append(mse)
-        if print_results:
-            print(f"Mean Squared Error for data.regression.test.{num}: {mse}")
-
-        if plot_results:
-            if num == numbers[-1]:
-                plt.figure(figsize=(10, 6))
-                plt.scatter(X, y, color='blue', label='Training Data', alpha=0.5, s=0.1)
-                plt.xlabel('X')
-                plt.ylabel('Y')
-                plt.legend()
-                plt.grid()
-                plt.show()
-
-                plt.figure(figsize=(10, 6))
-                plt.scatter(X_test, y_test, color='green', label='Test Data', alpha=0.5, s=1)
-                plt.plot(X_test, predictions, color='red', linewidth=1, label='Predictions', linestyle="-")
-                plt.xlabel('X')
-                plt.ylabel('Y')
-                plt.legend()
-                plt.grid()
-                plt.show()
-
-            nn.plot_weight_value_history()
-            nn.plot_error_history()
-
+    MSEs = _run_tests(_run_one_activation, numbers, path, seed, plot_results, pool, dtype)
+    if print_results:
+        for num, result in zip(numbers, MSEs):
+            print(f"Mean Squared Error for data.regression.test.{num}: {result}")
     return sum(MSEs) / len(MSEs)
 
-def perform_tests_cube(path, random_seed=False, print_results=False, plot_results=False):
+def _run_one_cube(num, path, seed, plot_results=False, last_num=None, dtype=np.float32):
     layers = [1,4,1]  
     activations = ["cube", "linear"] 
     learning_rate = 0.00000001
     epochs = 10000
+    loss_function = "mse" 
+
+    # learning_rate = 1.0/num
+    train_file_path = path + f"data.cube.train.{num}.csv"
+    data = read_csv_cached(train_file_path)
+
+    X = stack_columns(data, ['x']) 
+    y = stack_columns(data, ['y']) 
+    permutation = np.random.permutation(len(X))
+    X = X[permutation]
+    y = y[permutation]
+
+    #standarization of data
+    mean_X = np.mean(X, axis=0)
+    std_X = np.std(X, axis=0)
+    X_standardized = (X - mean_X) / std_X
+
+    mean_y = np.mean(y, axis=0)
+    std_y = np.std(y, axis=0)
+    y_standardized = (y - mean_y) / std_y
+
+    nn = Network(layers, activations, loss_function=loss_function, seed=seed, dtype=dtype)
+    nn.train(X_standardized, y_standardized, epochs, learning_rate, False, plot_results)  
+
+    test_file_path = path + f"data.cube.test.{num}.csv"
+    data = read_csv_cached(test_file_path)
+    X_test = stack_columns(data, ['x'])  
+    y_test = stack_columns(data, ['y']) 
+    X_test_standardized = (X_test - mean_X) / std_X
+
+
+    predictions_standardized = nn.predict(X_test_standardized, True)
+    predictions = predictions_standardized * std_y + mean_y
+
+    mse = mean_squared_error(y_test, predictions)
+
+    if plot_results:
+        if num == last_num:
+            plt.figure(figsize=(10, 6))
+            plt.scatter(X, y, color='blue', label='Training Data', alpha=0.5, s=0.1)
+            plt.xlabel('X')
+            plt.ylabel('Y')
+            plt.legend()
+            plt.grid()
+            plt.show()
+
+            plt.figure(figsize=(10, 6))
+            plt.scatter(X_test, y_test, color='green', label='Test Data', alpha=0.5, s=1)
+            plt.plot(X_test, predictions, color='red', linewidth=1, label='Predictions', linestyle="-")
+            plt.xlabel('X')
+            plt.ylabel('Y')
+            plt.legend()
+            plt.grid()
+            plt.show()
+
+        nn.plot_weight_value_history()
+        nn.plot_error_history()
+
+    return float(mse)
+
+def perform_tests_cube(path, random_seed=False, print_results=False, plot_results=False, pool=None, dtype=np.float32):
     if random_seed:
         seed = np.random.randint(1, 100)
     else:
         seed = 65
     print('seed', seed)
-    loss_function = "mse" 
 
     numbers = [100, 500, 1000, 10000]
-    MSEs = list()
-    for num in numbers:
-        # learning_rate = 1.0/num
-        train_file_path = path + f"data.cube.train.{num}.csv"
-        data = pd.read_csv(train_file_path, delimiter=',', header=0)
-        data = data.sample(frac=1).reset_index(drop=True)
-
-        X = data[['x']].to_numpy() 
-        y = data[['y']].to_numpy() 
-
-        #standarization of data
-        mean_X = np.mean(X, axis=0)
-        std_X = np.std(X, axis=0)
-        X_standardized = (X - mean_X) / std_X
-        
-        mean_y = np.mean(y, axis=0)
-        std_y = np.std(y, axis=0)
-        y_standardized = (y - mean_y) / std_y
-
-        nn = Network(layers, activations, loss_function=loss_function, seed=seed)
-        nn.train(X_standardized, y_standardized, epochs, learning_rate, False)  
-
-        test_file_path = path + f"data.cube.test.{num}.csv"
-        data = pd.read_csv(test_file_path, delimiter=',', header=0)
-        X_test = data[['x']].to_numpy()  
-        y_test = data[['y']].to_numpy() 
-        X_test_standardized = (X_test - mean_X) / std_X
-
-
-        predictions_standardized = nn.predict(X_test_standardized, True)
-        predictions = predictions_standardized * std_y + mean_y
-
-        mse = mean_squared_error(y_test, predictions)
-        MSEs.append(mse)
-        if print_results:
-            print(f"Mean Squared Error for data.regression.test.{num}: {mse}")
-
-        if plot_results:
-            if num == numbers[-1]:
-                plt.figure(figsize=(10, 6))
-                plt.scatter(X, y, color='blue', label='Training Data', alpha=0.5, s=0.1)
-                plt.xlabel('X')
-                plt.ylabel('Y')
-                plt.legend()
-                plt.grid()
-                plt.show()
-
-                plt.figure(figsize=(10, 6))
-                plt.scatter(X_test, y_test, color='green', label='Test Data', alpha=0.5, s=1)
-                plt.plot(X_test, predictions, color='red', linewidth=1, label='Predictions', linestyle="-")
-                plt.xlabel('X')
-                plt.ylabel('Y')
-                plt.legend()
-                plt.grid()
-                plt.show()
-
-            nn.plot_weight_value_history()
-            nn.plot_error_history()
-
+    MSEs = _run_tests(_run_one_cube, numbers, path, seed, plot_results, pool, dtype)
+    if print_results:
+        for num, result in zip(numbers, MSEs):
+            print(f"Mean Squared Error for data.regression.test.{num}: {result}")
     return sum(MSEs) / len(MSEs)
 
-def classification_tests(folder_path):
+def classification_tests(folder_path, dtype=np.float32):
     iterations = 1
-    accuracy = list()
-    for i in range(iterations):
-        accuracy.append(perform_tests_simple(folder_path, False, True, False))
-    print('Wynik:')
-    print(sum(accuracy)/len(accuracy))
-
-    accuracy = list()
-    for i in range(iterations):
-        accuracy.append(perform_tests_three_gauss(folder_path, False, True, False))
-    print('Wynik:')
-    print(sum(accuracy)/len(accuracy))
+    with create_test_pool() as pool:
+        accuracy = list()
+        for i in range(iterations):
+            accuracy.append(perform_tests_simple(folder_path, False, True, False, pool, dtype))
+        print('Wynik:')
+        print(sum(accuracy)/len(accuracy))
+
+        accuracy = list()
+        for i in range(iterations):
+            accuracy.append(perform_tests_three_gauss(folder_path, False, True, False, pool, dtype))
+        print('Wynik:')
+        print(sum(accuracy)/len(accuracy))
 
     return
 
-def regression_tests(folder_path):
+def regression_tests(folder_path, dtype=np.float32):
     iterations = 1
-    accuracy = list()
-    for i in range(iterations):
-        accuracy.append(perform_tests_activation(folder_path, False, True, False))
-    print('Wynik:')
-    print(sum(accuracy)/len(accuracy))
-
-    accuracy = list()
-    for i in range(iterations):
-        accuracy.append(perform_tests_cube(folder_path, False, True, False))
-    print('Wynik:')
-    print(sum(accuracy)/len(accuracy))
+    with create_test_pool() as pool:
+        accuracy = list()
+        for i in range(iterations):
+            accuracy.append(perform_tests_activation(folder_path, False, True, False, pool, dtype))
+        print('Wynik:')
+        print(sum(accuracy)/len(accuracy))
+
+        accuracy = list()
+        for i in range(iterations):
+            accuracy.append(perform_tests_cube(folder_path, False, True, False, pool, dtype))
+        print('Wynik:')
+        print(sum(accuracy)/len(accuracy))
 
     return
 
@@ -47,12 +47,14 @@ class WeatherPredictionNetwork:
         self.z_values = []
 
         for i in range(self.num_layers - 2):
-            z = cp.dot(self.activations_values[-1], self.weights[i]) + self.biases[i]
+            z = cp.dot(self.activations_values[-1], self.weights[i])
+            z += self.biases[i]
             self.z_values.append(z)
             a = self.apply_activation(z, self.activations[i])
             self.activations_values.append(a)
 
-        z_last = cp.dot(self.activations_values[-1], self.weights[-1]) + self.biases[-1]
+        z_last = cp.dot(self.activations_values[-1], self.weights[-1])
+        z_last += self.biases[-1]
         self.z_values.append(z_last)
         
         z_reg, z_cls = z_last[:, 0:1], z_last[:, 1:]